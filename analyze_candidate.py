@@ -1,9 +1,51 @@
 import os
-import json
+import functools
+from collections import Counter
 from typing import Optional
 from utils.github_browse_agent import GitHubBrowseAgent
 from utils.llm_client import LLMClient
 from utils.linkedin_browser_agent import get_linkedin_profile_data
+from utils.llm_cache import DiskLLMCache, make_cache_key
+from utils.fast_json import dumps_indented
+
+# Analyses are cached on disk so re-runs on unchanged candidates skip the LLM call
+llm_cache = DiskLLMCache()
+
+# Shared clients, so their connection pools are reused across candidates
+@functools.lru_cache(maxsize=1)
+def _gh_agent() -> GitHubBrowseAgent:
+    return GitHubBrowseAgent()
+
+@functools.lru_cache(maxsize=1)
+def _llm_client() -> LLMClient:
+    return LLMClient()
+
+# The analysis is a requirements table plus a recommendation, well under this; the rare
+# longer one is retried once with the larger cap rather than kept without its recommendation
+ANALYSIS_MAX_OUTPUT_TOKENS = 2048
+ANALYSIS_RETRY_MAX_OUTPUT_TOKENS = 4000
+# Bump when _serialize_prompt or the user prompt changes, so cached analyses are redone
+ANALYSIS_PROMPT_VERSION = "1"
+
+# Cheap checks on the GitHub data that reject a candidate before the LinkedIn and LLM calls
+PREFILTER_THRESHOLDS = {
+    'default': {'min_repositories': 1, 'min_followers': 0},
+    'product_engineer': {'min_repositories': 1, 'min_followers': 1},
+}
+
+# Rejection reason -> count, to help tune the thresholds
+prefilter_rejections = Counter()
+
+def prefilter_reason(github_data: dict, job_profile: str) -> Optional[str]:
+    """Return why the candidate fails the pre-filter for job_profile, or None if they pass."""
+    thresholds = PREFILTER_THRESHOLDS.get(job_profile, PREFILTER_THRESHOLDS['default'])
+    if not github_data:
+        return 'no_github_data'
+    if len(github_data['repositories']) < thresholds['min_repositories']:
+        return 'too_few_repositories'
+    if github_data['profile']['followers'] < thresholds['min_followers']:
+        return 'too_few_followers'
+    return None
 
 def read_job_requirements(job_profile: str) -> str:
     path = f"job_requirements/{job_profile}.txt"
@@ -12,33 +54,17 @@ def read_job_requirements(job_profile: str) -> str:
     with open(path) as f:
         return f.read()
 
-def analyze_candidate(github_url: str, job_profile: str = "product_engineer") -> Optional[str]:
-    # Gather job requirements
-    job_requirements = read_job_requirements(job_profile)
-    # Gather GitHub data using the new minimal client method
-    github_data = {}
-    if github_url:
-        username = github_url.rstrip('/').split('/')[-1]
-        gh_client = GitHubBrowseAgent()
-        github_data = gh_client.get_candidate_github_data(username)
-        linkedin_url = github_data.get('profile').get('linkedin_url')
-    # Gather LinkedIn data if available
-    linkedin_data = None
-    if linkedin_url:
-        print(f"LinkedIn URL: {linkedin_url}")
-        linkedin_result = get_linkedin_profile_data(linkedin_url)
-        if linkedin_result and linkedin_result.get('parsed_data'):
-            linkedin_data = linkedin_result['parsed_data']
-    # Compose system prompt for LLM
-    system_prompt = f"""
+def _serialize_prompt(job_requirements: str, github_data: dict, linkedin_data: Optional[dict]) -> str:
+    """Compose the evaluation system prompt from the job requirements and candidate data."""
+    return f"""
 You are an expert technical recruiter. Your task is to evaluate a candidate for the following job:
 
 [JOB REQUIREMENTS]
 {job_requirements}
 
 [CANDIDATE DATA]
-GitHub: {json.dumps(github_data, indent=2)}
-LinkedIn: {json.dumps(linkedin_data, indent=2) if linkedin_data else 'Not provided'}
+GitHub: {dumps_indented(github_data)}
+LinkedIn: {dumps_indented(linkedin_data) if linkedin_data else 'Not provided'}
 
 For each requirement, provide a brief, evidence-based data point from the candidate's profile (GitHub, LinkedIn, Twitter, etc.).
 
@@ -54,9 +80,45 @@ Produce a single, clear, structured analysis table mapping each requirement to t
 
 Finally, give a clear recommendation using one of these 5 levels: Strongly Shortlist, Shortlist, Neutral, Reject, Strongly Reject. Add a one-sentence justification for your recommendation.
 """
-    llm = LLMClient()
-    analysis = llm.get_completion(system_prompt, "Evaluate this candidate for the job above.")
+
+def analyze_candidate(github_url: str, job_profile: str = "product_engineer") -> Optional[str]:
+    # Gather job requirements
+    job_requirements = read_job_requirements(job_profile)
+    # Gather GitHub data with a single GraphQL round-trip
+    github_data = {}
+    if github_url:
+        username = github_url.rstrip('/').split('/')[-1]
+        github_data = _gh_agent().get_candidate_github_data_graphql(username)
+    # Skip LinkedIn and the LLM for candidates that clearly don't qualify
+    reason = prefilter_reason(github_data, job_profile)
+    if reason:
+        prefilter_rejections[reason] += 1
+        print(f"Skipping {github_url}: rejected by pre-filter ({reason})")
+        return None
+    linkedin_url = github_data['profile'].get('linkedin_url')
+    # Gather LinkedIn data if available
+    linkedin_data = None
+    if linkedin_url:
+        print(f"LinkedIn URL: {linkedin_url}")
+        linkedin_result = get_linkedin_profile_data(linkedin_url)
+        if linkedin_result and linkedin_result.get('parsed_data'):
+            linkedin_data = linkedin_result['parsed_data']
+    llm = _llm_client()
+    cache_key = make_cache_key(llm.model_name, ANALYSIS_PROMPT_VERSION, ANALYSIS_MAX_OUTPUT_TOKENS,
+                               job_profile, job_requirements, github_data, linkedin_data)
+    analysis = llm_cache.get(cache_key)
+    if analysis:
+        print(analysis)
+        return analysis
+    system_prompt = _serialize_prompt(job_requirements, github_data, linkedin_data)
+    # Already cached above under the candidate-level key
+    analysis = llm.get_completion(
+        system_prompt, "Evaluate this candidate for the job above.",
+        use_cache=False, max_output_tokens=ANALYSIS_MAX_OUTPUT_TOKENS,
+        retry_max_output_tokens=ANALYSIS_RETRY_MAX_OUTPUT_TOKENS
+    )
     if analysis:
+        llm_cache.set(cache_key, analysis)
         print(analysis)
     return analysis
 
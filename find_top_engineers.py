@@ -1,16 +1,30 @@
 import os
+import json
+import asyncio
+import atexit
+import logging
+import threading
+import time
 from datetime import datetime, timedelta
+from collections import deque
 from pathlib import Path
 import pytz
 import sys
-import re
 import argparse
-from analyze_candidate import analyze_candidate
-import shutil
+from concurrent.futures import ProcessPoolExecutor
+from utils.candidate_reports import parse_report_fields, candidate_info, parse_report
 
 CANDIDATES_DIR = Path("candidates")
 CANDIDATES_DIR.mkdir(exist_ok=True)
 PROCESSED_CANDIDATES_FILE = "processed_candidates.txt"
+# Processed entries are buffered and appended at most every N entries / T seconds, and at exit
+PROCESSED_FLUSH_EVERY = 20
+PROCESSED_FLUSH_INTERVAL = 5
+
+_processed = None
+_pending = []
+_last_flush = time.monotonic()
+_processed_lock = threading.Lock()
 
 # Top LLM/AI repositories to analyze
 INFLUENCER_REPOS = [
@@ -22,27 +36,69 @@ INFLUENCER_REPOS = [
 CUTOFF_DAYS = 90
 cutoff = datetime.now(pytz.UTC) - timedelta(days=CUTOFF_DAYS)
 
+# Number of candidates analyzed in parallel (GitHub + LinkedIn + LLM calls are I/O-bound)
+DEFAULT_CONCURRENCY = 8
+
+# Parsing a report inline takes ~20us; a spawn pool costs ~0.1-0.2s to start plus ~9us of
+# pickling per report in this process, so it only wins with several cores and about this many reports
+PARALLEL_PARSE_MIN_REPORTS = 10000
+
+
+# Pause the stargazer walk until the rate limit resets when fewer points than this remain
+RATE_LIMIT_FLOOR = 200
+
+# Where each repository's stargazer walk stopped: "owner/repo" -> [endCursor, last starredAt]
+STATE_DIR = Path(".state")
+STARGAZER_CURSORS_FILE = STATE_DIR / "stargazer_cursors.json"
+
+# One page of stargazers (oldest first, so new stars land after saved cursors) with the fields needed to pre-filter them, plus the remaining rate limit
+STARGAZERS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    stargazers(first: 100, after: $cursor, orderBy: {field: STARRED_AT, direction: ASC}) {
+      pageInfo { endCursor hasNextPage }
+      edges { starredAt node { login url updatedAt } }
+    }
+  }
+  rateLimit { remaining resetAt }
+}
+"""
+
 # --- Utility functions ---
-def get_candidate_dir(github_url):
-    if not github_url:
-        return None
-    dirname = github_url.rstrip('/').split('/')[-1]
-    candidate_dir = CANDIDATES_DIR / dirname
-    candidate_dir.mkdir(exist_ok=True)
-    return candidate_dir
+def _load_processed_candidates():
+    """Load processed_candidates.txt into memory on first use. Caller must hold _processed_lock."""
+    global _processed
+    if _processed is None:
+        _processed = set()
+        if os.path.exists(PROCESSED_CANDIDATES_FILE):
+            with open(PROCESSED_CANDIDATES_FILE, 'r') as f:
+                _processed = set(line.strip() for line in f)
+    return _processed
 
-def get_report_path(github_url):
-    if not github_url:
-        return None
-    return get_candidate_dir(github_url) / "report.md"
+def _flush_pending_locked():
+    """Append pending entries in a single write. Caller must hold _processed_lock."""
+    global _last_flush
+    if _pending:
+        with open(PROCESSED_CANDIDATES_FILE, 'a') as f:
+            f.writelines(f"{url}\n" for url in _pending)
+        _pending.clear()
+    _last_flush = time.monotonic()
+
+def flush_processed_candidates():
+    try:
+        with _processed_lock:
+            _flush_pending_locked()
+    except Exception as e:
+        print(f"Error flushing processed candidates: {str(e)}")
+
+atexit.register(flush_processed_candidates)
 
 def is_candidate_processed(github_url):
     try:
-        if not github_url or not os.path.exists(PROCESSED_CANDIDATES_FILE):
+        if not github_url:
             return False
-        with open(PROCESSED_CANDIDATES_FILE, 'r') as f:
-            processed = set(line.strip() for line in f)
-            return github_url in processed
+        with _processed_lock:
+            return github_url in _load_processed_candidates()
     except Exception as e:
         print(f"Error checking processed candidates: {str(e)}")
         return False
@@ -50,114 +106,283 @@ def is_candidate_processed(github_url):
 def mark_candidate_processed(github_url):
     try:
         if github_url:
-            with open(PROCESSED_CANDIDATES_FILE, 'a') as f:
-                f.write(f"{github_url}\n")
+            with _processed_lock:
+                _load_processed_candidates().add(github_url)
+                _pending.append(github_url)
+                if (len(_pending) >= PROCESSED_FLUSH_EVERY or
+                        time.monotonic() - _last_flush >= PROCESSED_FLUSH_INTERVAL):
+                    _flush_pending_locked()
     except Exception as e:
         print(f"Error marking candidate as processed: {str(e)}")
         sys.exit(1)
 
-def move_report_to_status_folder(report_path):
-    """Move the report to a subfolder based on the recommendation in the report."""
-    with open(report_path, 'r') as f:
-        content = f.read()
-    recommendation_match = re.search(r'\*\*Recommendation:\*\*\s*([^\n]+)', content)
-    if recommendation_match:
-        recommendation = recommendation_match.group(1).strip().lower()
-        base_dir = Path("candidates")
-        if "strongly shortlist" in recommendation:
-            folder = base_dir / "strongly_shortlist"
-        elif "shortlist" in recommendation:
-            folder = base_dir / "shortlist"
-        else:
-            folder = base_dir / "reject"
-        folder.mkdir(exist_ok=True)
-        shutil.move(str(report_path), str(folder / report_path.name))
-        return folder / report_path.name
-    return report_path
+# Every folder _recommendation_folder can pick
+REPORT_STATUS_FOLDERS = ("strongly_shortlist", "shortlist", "reject", "unclassified")
+
+def _recommendation_folder(fields):
+    """Pick the status folder for a report from its parsed recommendation."""
+    recommendation = fields.get('Recommendation')
+    if not recommendation:
+        return CANDIDATES_DIR / "unclassified"
+    recommendation = recommendation.lower()
+    if "strongly shortlist" in recommendation:
+        return CANDIDATES_DIR / "strongly_shortlist"
+    elif "shortlist" in recommendation:
+        return CANDIDATES_DIR / "shortlist"
+    return CANDIDATES_DIR / "reject"
+
+def write_report(login, analysis):
+    """Write the report straight into its status folder; returns its path and parsed header fields."""
+    fields = parse_report_fields(analysis)
+    folder = _recommendation_folder(fields)
+    folder.mkdir(parents=True, exist_ok=True)
+    report_path = folder / f"{login}.md"
+    report_path.write_text(analysis)
+    # A reanalysis can change the recommendation; don't leave the old report counted in its old folder
+    for status_folder in REPORT_STATUS_FOLDERS:
+        stale_path = CANDIDATES_DIR / status_folder / report_path.name
+        if stale_path != report_path:
+            stale_path.unlink(missing_ok=True)
+    return report_path, fields
 
 def analyze_user(user, repo, force_reanalysis=False):
+    """Analyze a stargazer given as {'login', 'url', 'updated_at'}; needs no GitHub call to pre-filter."""
+    # Imported on first use: under spawn every report-parsing worker re-imports this module, and
+    # analyze_candidate pulls in browser_use, langchain and openai, which takes seconds per worker
+    from analyze_candidate import analyze_candidate
     try:
-        if not force_reanalysis and is_candidate_processed(user.html_url):
+        if not force_reanalysis and is_candidate_processed(user['url']):
             return None
-        p = user  # Use the PyGithub NamedUser object directly
-        user_updated = p.updated_at.replace(tzinfo=pytz.UTC) if p.updated_at.tzinfo is None else p.updated_at
-        if user_updated < cutoff:
+        if user['updated_at'] < cutoff:
             return None
-        analysis = analyze_candidate(github_url=p.html_url)
+        analysis = analyze_candidate(github_url=user['url'])
         if analysis:
-            report_path = get_report_path(p.html_url)
-            if report_path:
-                with open(report_path, 'w') as f:
-                    f.write(analysis)
-                # Move report to status folder
-                new_report_path = move_report_to_status_folder(report_path)
-            mark_candidate_processed(p.html_url)
+            report_path, report_fields = write_report(user['login'], analysis)
+            mark_candidate_processed(user['url'])
             return {
-                "login": p.login,
-                "url": p.html_url,
-                "analysis": analysis
+                "login": user['login'],
+                "url": user['url'],
+                "analysis": analysis,
+                "report_path": report_path,
+                "report_fields": report_fields
             }
         return None
     except Exception as e:
-        print(f"Fatal error analyzing user {user.login}: {str(e)}")
+        print(f"Fatal error analyzing user {user['login']}: {str(e)}")
         sys.exit(1)
 
-def get_shortlisted_candidates():
-    all_candidates = {}
-    base_dir = Path("candidates")
-    for status_folder in ["shortlist", "strongly_shortlist"]:
-        folder = base_dir / status_folder
-        if not folder.exists():
-            continue
-        for report_path in folder.glob("*/report.md"):
-            with open(report_path, 'r') as f:
-                content = f.read()
-                eval_status = re.search(r'\*\*Recommendation:\*\*\s*([^\n]+)', content)
-                name = re.search(r'\*\*Name:\*\*\s*([^\n]+)', content)
-                location = re.search(r'\*\*Location:\*\*\s*([^\n]+)', content)
-                linkedin = re.search(r'\*\*LinkedIn:\*\*\s*([^\n]+)', content)
-                github = re.search(r'\*\*GitHub:\*\*\s*([^\n]+)', content)
-                candidate_info = {
-                    'name': name.group(1).strip() if name else 'Unknown',
-                    'location': location.group(1).strip() if location else 'Unable to verify',
-                    'linkedin': linkedin.group(1).strip() if linkedin else 'Unable to verify',
-                    'github': github.group(1).strip() if github else 'Unknown',
-                    'evaluation_status': eval_status.group(1).strip() if eval_status else 'Limited',
-                    'report_path': str(report_path),
-                    'last_updated': os.path.getmtime(report_path)
-                }
-                key = github.group(1).strip() if github else None
-                if key:
-                    all_candidates[key] = candidate_info
-    shortlisted = sorted(all_candidates.values(), key=lambda x: x['last_updated'], reverse=True)
-    return shortlisted
+def load_stargazer_cursors():
+    try:
+        with open(STARGAZER_CURSORS_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Error loading stargazer cursors, starting from scratch: {str(e)}")
+        return {}
+
+def save_stargazer_cursors(cursors):
+    try:
+        STATE_DIR.mkdir(exist_ok=True)
+        tmp_path = STARGAZER_CURSORS_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(cursors, f, indent=2)
+        os.replace(tmp_path, STARGAZER_CURSORS_FILE)
+    except OSError as e:
+        print(f"Error saving stargazer cursors: {str(e)}")
+
+def parse_github_datetime(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+async def iter_recent_stargazer_pages(gh_agent, owner, repo_name, cursor=None):
+    """
+    Yield (stargazers, cursor_state) per page of 100 stargazers, one GraphQL request each.
+
+    `stargazers` holds {'login', 'url', 'updated_at'} for those updated since the
+    cutoff; `cursor_state` is the [endCursor, last starredAt] to persist once all
+    of them are analyzed. The walk starts after `cursor`.
+    """
+    while True:
+        data = await asyncio.to_thread(gh_agent.graphql, STARGAZERS_QUERY, {
+            'owner': owner, 'name': repo_name, 'cursor': cursor
+        })
+        stargazers = data['repository']['stargazers']
+        recent = []
+        for edge in stargazers['edges']:
+            node = edge['node']
+            updated_at = parse_github_datetime(node['updatedAt'])
+            if updated_at >= cutoff:
+                recent.append({'login': node['login'], 'url': node['url'], 'updated_at': updated_at})
+        if stargazers['edges']:
+            cursor = stargazers['pageInfo']['endCursor']
+            yield recent, [cursor, stargazers['edges'][-1]['starredAt']]
+        if not stargazers['pageInfo']['hasNextPage']:
+            return
+        rate_limit = data['rateLimit']
+        if rate_limit['remaining'] < RATE_LIMIT_FLOOR:
+            wait = (parse_github_datetime(rate_limit['resetAt']) - datetime.now(pytz.UTC)).total_seconds()
+            print(f"GitHub rate limit low ({rate_limit['remaining']} left), sleeping {max(wait, 0):.0f}s")
+            await asyncio.sleep(max(wait, 0) + 1)
+
+class StargazerCheckpoints:
+    """Persist a repository's stargazer cursor only once every user on that page, and on all earlier pages, is finished.
+
+    Users still queued when the run stops (enough shortlisted, crash, Ctrl-C)
+    therefore stay ahead of the saved cursor and are picked up by the next run.
+    Only touched from the event loop thread, so it needs no locking.
+    """
+
+    def __init__(self, cursors):
+        self.cursors = cursors
+        self.open_pages = {}
+
+    def open_page(self, repo, cursor_state, pending):
+        """Register a page about to be queued; returns the handle to pass to finish()."""
+        page = [cursor_state, pending]
+        self.open_pages.setdefault(repo, deque()).append(page)
+        self._advance(repo)
+        return page
+
+    def finish(self, repo, page):
+        page[1] -= 1
+        self._advance(repo)
+
+    def _advance(self, repo):
+        pages = self.open_pages[repo]
+        advanced = False
+        while pages and pages[0][1] == 0:
+            self.cursors[repo] = pages.popleft()[0]
+            advanced = True
+        if advanced:
+            save_stargazer_cursors(self.cursors)
+
+class ShortlistIndex:
+    """In-memory index of shortlisted candidates, keyed by GitHub URL.
+
+    The candidates/ tree is only scanned once at startup; reports finalized
+    during the run are added from the analysis text already in memory.
+    """
+
+    STATUS_FOLDERS = ("shortlist", "strongly_shortlist")
+
+    def __init__(self):
+        self.by_github = {}
+
+    @classmethod
+    def from_disk(cls, base_dir=CANDIDATES_DIR):
+        report_entries = []
+        for status_folder in cls.STATUS_FOLDERS:
+            folder = Path(base_dir) / status_folder
+            if not folder.exists():
+                continue
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.md') and entry.is_file():
+                        report_entries.append((entry.path, entry.stat().st_mtime))
+        if len(report_entries) >= PARALLEL_PARSE_MIN_REPORTS and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                parsed = list(executor.map(parse_report, report_entries, chunksize=256))
+        else:
+            parsed = [parse_report(report_entry) for report_entry in report_entries]
+        index = cls()
+        for info in parsed:
+            if info:
+                index.by_github[info['github']] = info
+        return index
+
+    def add(self, report_path, fields):
+        """Index a finalized report from its parsed fields; reports outside the shortlist folders drop any earlier entry."""
+        if Path(report_path).parent.name not in self.STATUS_FOLDERS:
+            self.by_github.pop(fields.get('GitHub'), None)
+            return
+        info = candidate_info(fields, report_path)
+        if info:
+            self.by_github[info['github']] = info
+
+    def top(self, n=None):
+        shortlisted = sorted(self.by_github.values(), key=lambda x: x['last_updated'], reverse=True)
+        return shortlisted[:n] if n is not None else shortlisted
+
+    def __len__(self):
+        return len(self.by_github)
+
+async def find_shortlisted_candidates(gh_agent, top_n, force_reanalysis=False, concurrency=DEFAULT_CONCURRENCY,
+                                      restart_stargazers=False):
+    """Analyze stargazers of INFLUENCER_REPOS concurrently until top_n candidates are shortlisted."""
+    index = ShortlistIndex.from_disk()
+    if len(index) >= top_n:
+        return index.top()
+    processed_users = set(index.by_github)
+    enough = asyncio.Event()
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        while True:
+            stargazer, repo, page = await queue.get()
+            try:
+                # Left unfinished, so its page's cursor isn't saved and the next run sees it again
+                if enough.is_set():
+                    continue
+                if stargazer['url'] not in processed_users:
+                    # analyze_user is blocking, run it off the event loop
+                    result = await asyncio.to_thread(analyze_user, stargazer, repo, force_reanalysis)
+                    if result:
+                        processed_users.add(result['url'])
+                        index.add(result['report_path'], result['report_fields'])
+                        if len(index) >= top_n:
+                            enough.set()
+                checkpoints.finish(repo, page)
+            finally:
+                queue.task_done()
+
+    # Reanalysis has to see the stargazers behind the saved cursors too
+    cursors = {} if restart_stargazers or force_reanalysis else load_stargazer_cursors()
+    checkpoints = StargazerCheckpoints(cursors)
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for owner, repo_name in INFLUENCER_REPOS:
+            if enough.is_set():
+                break
+            repo = f"{owner}/{repo_name}"
+            start_cursor = cursors.get(repo, [None, None])[0]
+            async for stargazers, cursor_state in iter_recent_stargazer_pages(gh_agent, owner, repo_name, start_cursor):
+                if enough.is_set():
+                    break
+                stargazers = [s for s in stargazers if s['url'] not in processed_users]
+                page = checkpoints.open_page(repo, cursor_state, len(stargazers))
+                for stargazer in stargazers:
+                    if enough.is_set():
+                        break
+                    await queue.put((stargazer, repo, page))
+        await queue.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    return index.top()
 
 def main():
     parser = argparse.ArgumentParser(description='Find top shortlisted product engineering candidates')
-    parser.add_argument('--force-reanalysis', action='store_true', help='Force reanalysis of cached users')
+    parser.add_argument('--force-reanalysis', action='store_true', help='Force reanalysis of cached users (walks stargazers from the beginning)')
     parser.add_argument('--top-n', type=int, default=20, help='Number of shortlisted candidates to show')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Number of candidates to analyze in parallel')
+    parser.add_argument('--restart-stargazers', action='store_true', help='Walk stargazers from the beginning instead of the saved cursors')
     args = parser.parse_args()
+    # Surface the utils modules' progress and error logs like the prints around them
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s")
+    logging.getLogger("utils").setLevel(logging.INFO)
 
-    import github
-    gh = github.Github(os.getenv('GITHUB_TOKEN'))
-    shortlisted = get_shortlisted_candidates()
-    processed_users = set()
-    for c in shortlisted:
-        processed_users.add(c['github'])
-
-    print("\nAnalyzing candidates until at least 20 are shortlisted...")
-    for owner, repo_name in INFLUENCER_REPOS:
-        repo = gh.get_repo(f"{owner}/{repo_name}")
-        stargazers = repo.get_stargazers()
-        for user in stargazers:
-            if len(shortlisted) >= args.top_n:
-                break
-            if user.html_url in processed_users:
-                continue
-            result = analyze_user(user, repo, args.force_reanalysis)
-            if result:
-                processed_users.add(result['url'])
-                shortlisted = get_shortlisted_candidates()
+    # Deferred like in analyze_user, to keep report-parsing workers cheap to start
+    from analyze_candidate import prefilter_rejections
+    from utils.github_browse_agent import GitHubBrowseAgent
+    gh_agent = GitHubBrowseAgent()
+
+    print(f"\nAnalyzing candidates until at least {args.top_n} are shortlisted...")
+    shortlisted = asyncio.run(find_shortlisted_candidates(
+        gh_agent, args.top_n, args.force_reanalysis, args.concurrency, args.restart_stargazers
+    ))
+    if prefilter_rejections:
+        print(f"\nPre-filter rejections: {dict(prefilter_rejections)}")
     if not shortlisted:
         print("\nNo suitable candidates found!")
         sys.exit(1)
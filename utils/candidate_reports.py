@@ -0,0 +1,56 @@
+# Candidate report parsing, kept to the stdlib so process-pool workers start cheaply
+import os
+import re
+
+# Report header fields, matched in one pass
+REPORT_FIELD_RE = re.compile(r'\*\*(?P<key>Recommendation|Name|Location|LinkedIn|GitHub):\*\*\s*(?P<val>[^\n]+)')
+# Bytes read from each end of an existing report when indexing it at startup
+REPORT_SCAN_BYTES = 2048
+
+def parse_report_fields(content):
+    """Extract the header fields (Recommendation, Name, ...) from report text in one pass; first match wins."""
+    fields = {}
+    for match in REPORT_FIELD_RE.finditer(content):
+        fields.setdefault(match.group('key'), match.group('val').strip())
+    return fields
+
+def candidate_info(fields, report_path, last_updated=None):
+    """Build a shortlist entry from a report's parsed fields, or None if it has no GitHub link."""
+    if 'GitHub' not in fields:
+        return None
+    return {
+        'name': fields.get('Name', 'Unknown'),
+        'location': fields.get('Location', 'Unable to verify'),
+        'linkedin': fields.get('LinkedIn', 'Unable to verify'),
+        'github': fields['GitHub'],
+        'evaluation_status': fields.get('Recommendation', 'Limited'),
+        'report_path': str(report_path),
+        'last_updated': last_updated if last_updated is not None else os.path.getmtime(report_path)
+    }
+
+def read_report_fields_text(report_path):
+    """Read only the head and tail of a report, where its header fields and recommendation usually live.
+
+    Returns the text and whether it is the whole report.
+    """
+    with open(report_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= 2 * REPORT_SCAN_BYTES:
+            return f.read().decode('utf-8', errors='replace'), True
+        head = f.read(REPORT_SCAN_BYTES)
+        f.seek(-REPORT_SCAN_BYTES, os.SEEK_END)
+        tail = f.read()
+    # Drop the lines cut in half at either boundary
+    head = head[:head.rfind(b'\n') + 1]
+    tail = tail[tail.find(b'\n') + 1:]
+    return (head + tail).decode('utf-8', errors='replace'), False
+
+def parse_report(report_entry):
+    """Parse one (path, mtime) report entry; top-level so it can run in a worker process."""
+    report_path, last_updated = report_entry
+    text, complete = read_report_fields_text(report_path)
+    fields = parse_report_fields(text)
+    if not complete and ('GitHub' not in fields or 'Recommendation' not in fields):
+        # The fields sit mid-report; parse the full text, as write_report did
+        with open(report_path, encoding='utf-8', errors='replace') as f:
+            fields = parse_report_fields(f.read())
+    return candidate_info(fields, report_path, last_updated)
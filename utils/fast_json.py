@@ -0,0 +1,26 @@
+import json
+from typing import Any, Union
+
+# orjson is several times faster than the stdlib; it is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_indented(obj: Any) -> str:
+    """Serialize obj as 2-space indented JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def dumps_canonical(obj: Any) -> bytes:
+    """Serialize obj as compact JSON with sorted keys, for hashing."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode()
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text; raises a json.JSONDecodeError subclass on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,18 +3,257 @@ from typing import Dict, Any, List, Optional
 from github import Github
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import re
 
+# selectolax is a much faster C parser; fall back to BeautifulSoup (lxml if installed)
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+try:
+    import lxml  # noqa: F401
+    BS4_PARSER = "lxml"
+except ImportError:
+    BS4_PARSER = "html.parser"
+
 # Load environment variables
 load_dotenv()
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+PROFILE_PAGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
+}
+
+# LinkedIn URL forms, most to least specific
+LINKEDIN_RE = re.compile(
+    r"(?P<full>https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9\-_%]+/?)"
+    r"|(?P<bare>linkedin\.com/in/[a-zA-Z0-9\-_%]+/?)"
+    r"|(?P<in>\bin/[a-zA-Z0-9\-_%]+/?)"
+    r"|(?P<at>@[a-zA-Z0-9\-_%]+)",
+    re.IGNORECASE
+)
+LINKEDIN_PRIORITY = ('full', 'bare', 'in', 'at')
+# Bare @handles are mostly false positives once a README is included, so only
+# accept them when the searched text is short (bio and links only)
+LINKEDIN_HANDLE_TEXT_LIMIT = 300
+
+# Everything get_candidate_github_data needs, in a single round-trip
+CANDIDATE_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    login
+    name
+    location
+    bio
+    websiteUrl
+    company
+    email
+    url
+    createdAt
+    updatedAt
+    followers { totalCount }
+    following { totalCount }
+    gists(privacy: PUBLIC) { totalCount }
+    organizations { totalCount }
+    allRepositories: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    repositories(first: 100, privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes {
+        name
+        description
+        primaryLanguage { name }
+        stargazerCount
+        url
+        createdAt
+        updatedAt
+      }
+    }
+    socialAccounts(first: 10) {
+      nodes { provider url }
+    }
+  }
+}
+"""
+
+def _is_external_link(href: str) -> bool:
+    return (href.startswith('http') and
+            not href.startswith('https://github.com') and
+            not href.startswith('https://docs.github.com') and
+            not href.startswith('https://support.github.com'))
+
+def extract_profile_text(html: str) -> str:
+    """Collect the bio, external profile links and profile README text of a GitHub profile page."""
+    text_to_search = ""
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        bio_section = tree.css_first('[data-bio-text]')
+        if bio_section:
+            text_to_search += bio_section.text(separator=" ", strip=True) + " "
+        social_links_container = tree.css_first('.js-profile-editable-area')
+        if social_links_container:
+            for link in social_links_container.css("a[href]"):
+                href = link.attributes.get("href") or ""
+                if _is_external_link(href):
+                    text_to_search += href + " "
+        readme_content = tree.css_first('[data-target="readme-toc.content"]')
+        if readme_content:
+            text_to_search += readme_content.text(separator=" ", strip=True) + " "
+        return text_to_search
+    soup = BeautifulSoup(html, BS4_PARSER)
+    bio_section = soup.select_one('[data-bio-text]')
+    if bio_section:
+        text_to_search += bio_section.get_text(" ", strip=True) + " "
+    social_links_container = soup.select_one('.js-profile-editable-area')
+    if social_links_container:
+        for link in social_links_container.select("a[href]"):
+            href = link.get("href", "")
+            if _is_external_link(href):
+                text_to_search += href + " "
+    readme_content = soup.select_one('[data-target="readme-toc.content"]')
+    if readme_content:
+        text_to_search += readme_content.get_text(" ", strip=True) + " "
+    return text_to_search
+
+def find_linkedin_url(text_to_search: str) -> Optional[str]:
+    """Find the most specific LinkedIn profile reference in text and normalize it to a URL."""
+    # Single pass: keep the highest-priority form seen, stop early on a full URL
+    allow_handle = len(text_to_search) <= LINKEDIN_HANDLE_TEXT_LIMIT
+    best_match, best_rank = None, len(LINKEDIN_PRIORITY)
+    for match in LINKEDIN_RE.finditer(text_to_search):
+        kind = match.lastgroup
+        if kind == 'at' and not allow_handle:
+            continue
+        rank = LINKEDIN_PRIORITY.index(kind)
+        if rank < best_rank:
+            best_match, best_rank = match, rank
+            if rank == 0:
+                break
+    if not best_match:
+        return None
+    url = best_match.group(best_match.lastgroup)
+    if best_match.lastgroup == 'at':
+        url = f"https://linkedin.com/in/{url[1:]}"
+    elif best_match.lastgroup == 'in':
+        url = f"https://linkedin.com/{url}"
+    elif best_match.lastgroup == 'bare':
+        url = f"https://{url}"
+    return url.rstrip('/')
+
 class GitHubBrowseAgent:
     def __init__(self):
         github_token = os.getenv('GITHUB_TOKEN')
         if not github_token:
             raise ValueError("GitHub token not found")
+        self.token = github_token
         self.client = Github(github_token)
+        # Shared keep-alive pool for GraphQL calls and profile page scrapes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run a GitHub GraphQL query.
+
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+
+        Returns:
+            Dict[str, Any]: The `data` member of the response
+
+        Raises:
+            requests.RequestException, RuntimeError: On HTTP or GraphQL errors
+        """
+        response = self.session.post(
+            GITHUB_GRAPHQL_URL,
+            json={'query': query, 'variables': variables or {}},
+            headers={'Authorization': f"bearer {self.token}"},
+            timeout=30
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise RuntimeError(f"GraphQL error: {payload['errors'][0].get('message')}")
+        return payload['data']
+
+    def get_candidate_github_data_graphql(self, username: str) -> Dict[str, Any]:
+        """
+        Same result as get_candidate_github_data, fetched with one GraphQL query.
+
+        Only the 100 most recently updated non-fork repositories are returned.
+        The LinkedIn URL comes from the profile's social accounts; the profile
+        page is only scraped when none is listed there.
+        """
+        try:
+            user = self.graphql(CANDIDATE_QUERY, {'login': username})['user']
+            if not user:
+                raise ValueError(f"User {username} not found")
+            linkedin_url = None
+            for account in user['socialAccounts']['nodes']:
+                if account['provider'] == 'LINKEDIN':
+                    linkedin_url = account['url'].rstrip('/')
+                    break
+            if not linkedin_url:
+                linkedin_url = self.get_linkedin_from_github(user['login'])
+            profile = {
+                'login': user['login'],
+                'name': user['name'],
+                'location': user['location'],
+                'bio': user['bio'],
+                'blog': user['websiteUrl'],
+                'company': user['company'],
+                'email': user['email'] or None,
+                'public_repos': user['allRepositories']['totalCount'],
+                'followers': user['followers']['totalCount'],
+                'following': user['following']['totalCount'],
+                'created_at': user['createdAt'],
+                'updated_at': user['updatedAt'],
+                'html_url': user['url'],
+                'linkedin_url': linkedin_url
+            }
+            repos = []
+            for repo in user['repositories']['nodes']:
+                repos.append({
+                    'name': repo['name'],
+                    'description': repo['description'],
+                    'language': repo['primaryLanguage']['name'] if repo['primaryLanguage'] else None,
+                    'stars': repo['stargazerCount'],
+                    'html_url': repo['url'],
+                    'created_at': repo['createdAt'],
+                    'updated_at': repo['updatedAt']
+                })
+            organization_count = user['organizations']['totalCount']
+            stats = {
+                'total_contributions': 0,
+                'languages_used': {},
+                'collaboration_indicators': {
+                    'contributed_to_others_repos': 0,
+                    'has_organizations': organization_count > 0,
+                    'organization_count': organization_count
+                },
+                'community_engagement': {
+                    'public_gists': user['gists']['totalCount'],
+                    'followers': profile['followers'],
+                    'following': profile['following']
+                }
+            }
+            for repo in repos:
+                lang = repo['language']
+                if lang:
+                    stats['languages_used'][lang] = stats['languages_used'].get(lang, 0) + 1
+            return {
+                'profile': profile,
+                'repositories': repos,
+                'contribution_stats': stats
+            }
+        except Exception as e:
+            print(f"Error fetching GitHub data: {str(e)}")
+            return {}
 
     def get_candidate_github_data(self, username: str) -> Dict[str, Any]:
         try:
@@ -50,13 +289,14 @@ class GitHubBrowseAgent:
                         'updated_at': repo.updated_at.isoformat()
                     })
             # Contribution stats (minimal)
+            organization_count = user.get_orgs().totalCount
             stats = {
                 'total_contributions': 0,  # Not available via API without scraping
                 'languages_used': {},
                 'collaboration_indicators': {
                     'contributed_to_others_repos': 0,  # Not available via API
-                    'has_organizations': bool(user.get_orgs().totalCount > 0),
-                    'organization_count': user.get_orgs().totalCount
+                    'has_organizations': organization_count > 0,
+                    'organization_count': organization_count
                 },
                 'community_engagement': {
                     'public_gists': user.public_gists,
@@ -80,48 +320,9 @@ class GitHubBrowseAgent:
 
     def get_linkedin_from_github(self, username: str) -> Optional[str]:
         url = f"https://github.com/{username}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-        }
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=PROFILE_PAGE_HEADERS, timeout=10)
             response.raise_for_status()
         except requests.RequestException as e:
             return None
-        soup = BeautifulSoup(response.text, "html.parser")
-        text_to_search = ""
-        bio_section = soup.select_one('[data-bio-text]')
-        if bio_section:
-            text_to_search += bio_section.get_text(" ", strip=True) + " "
-        social_links_container = soup.select_one('.js-profile-editable-area')
-        if social_links_container:
-            social_links = social_links_container.select("a[href]")
-            for link in social_links:
-                href = link.get("href", "")
-                if (href.startswith('http') and 
-                    not href.startswith('https://github.com') and 
-                    not href.startswith('https://docs.github.com') and
-                    not href.startswith('https://support.github.com')):
-                    text_to_search += href + " "
-        readme_content = soup.select_one('[data-target="readme-toc.content"]')
-        if readme_content:
-            text_to_search += readme_content.get_text(" ", strip=True) + " "
-        linkedin_patterns = [
-            r"(https?://(www\.)?linkedin\.com/in/[a-zA-Z0-9\-_%]+/?)",
-            r"(linkedin\.com/in/[a-zA-Z0-9\-_%]+/?)",
-            r"(in/[a-zA-Z0-9\-_%]+/?)",
-            r"(@[a-zA-Z0-9\-_%]+)"
-        ]
-        for pattern in linkedin_patterns:
-            linkedin_match = re.search(pattern, text_to_search, re.IGNORECASE)
-            if linkedin_match:
-                url = linkedin_match.group(1)
-                if not url.startswith('http'):
-                    if url.startswith('@'):
-                        url = f"https://linkedin.com/in/{url[1:]}"
-                    elif url.startswith('in/'):
-                        url = f"https://linkedin.com/{url}"
-                    else:
-                        url = f"https://{url}"
-                return url.rstrip('/')
-        return None
\ No newline at end of file
+        return find_linkedin_url(extract_profile_text(response.text))
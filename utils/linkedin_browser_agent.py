@@ -1,86 +1,409 @@
 import os
+import sys
 import asyncio
-from typing import Dict, Any, Optional
+import atexit
+import logging
+import threading
+import weakref
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 from browser_use import Agent, BrowserSession
 from langchain_openai import ChatOpenAI
+# Let the __main__ smoke test run as a script (python utils/linkedin_browser_agent.py), not only with -m
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.fast_json import loads as json_loads
+from utils.llm_cache import LLMCache, DiskLLMCache, make_cache_key
+
+# uvloop schedules the CDP and OpenAI traffic with less overhead; the stdlib loop works too
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Profile fields the extraction returns by default, with the hint given to the agent for each
+FIELD_DESCRIPTIONS = {
+    'Name': 'Name',
+    'Headline': 'Headline (job title and company)',
+    'Location': 'Location',
+    'Current Position': 'Current position details',
+    'Previous Experience': 'Previous experience',
+    'Education': 'Education',
+    'Skills': 'Skills',
+    'About': 'About/Summary',
+}
+DEFAULT_FIELDS = list(FIELD_DESCRIPTIONS)
+
+# Bump when the extraction prompt or selectors change, so cached profiles are re-scraped
+PROFILE_PROMPT_VERSION = "1"
+PROFILE_CACHE_DIR = ".cache/linkedin"
+PROFILE_CACHE_TTL = 86400
+
+# Agent task prompt. The profile URL is the only per-call value and comes last, so the
+# long static prefix stays identical across profiles and can be served from the provider's prompt cache.
+_EXTRACTION_TEMPLATE = """
+Navigate directly to the profile URL given at the end of this task and extract the profile information.
+Steps:
+1. REMEMBER the most important RULE: ALWAYS open first a new tab.
+2. Go directly to the profile URL. Ensure that the page URL is exactly the profile URL. Otherwise, stop here & fail the task.
+3. Extract the following information:
+{field_lines}
+Do not search Google or use any search engine. Go directly to the provided URL.
+Return the data as a JSON object with keys: {keys}.
+If any information is not available, mark it as "Not available".
+
+DO IT IN ONE SHOT. Don't unnecessary reiterate.
+
+Profile URL: {url}
+"""
+
+@lru_cache(maxsize=32)
+def _field_lines(fields: Tuple[str, ...]) -> str:
+    return "\n".join(f"   - {FIELD_DESCRIPTIONS.get(field, field)}" for field in fields)
+
+# Stable DOM locations of profile fields, per domain. "all" fields collect every match as a list.
+DOM_SELECTORS = {
+    'linkedin.com': {
+        'Name': {'selector': 'main h1'},
+        'Headline': {'selector': 'main .text-body-medium.break-words'},
+        'Location': {'selector': 'main .text-body-small.inline.t-black--light.break-words'},
+        'About': {'selector': 'section:has(#about) .inline-show-more-text span[aria-hidden="true"]'},
+        'Previous Experience': {'selector': 'section:has(#experience) li.artdeco-list__item', 'all': True},
+        'Education': {'selector': 'section:has(#education) li.artdeco-list__item', 'all': True},
+        'Skills': {'selector': 'section:has(#skills) li.artdeco-list__item', 'all': True},
+    }
+}
+# The DOM result is only trusted when these fields were found
+DOM_REQUIRED_FIELDS = ('Name', 'Headline')
+DOM_NAVIGATION_TIMEOUT_MS = 15000
+
+# Pause after a failed agent step, by error type (first match wins), before browser_use retries it.
+# Navigation hiccups clear almost immediately; anything unrecognized gets the longest wait.
+RETRY_DELAYS = (
+    ('navigation', 0.5),
+    ('detach', 1.0),
+    ('connection', 1.0),
+)
+DEFAULT_RETRY_DELAY = 3.0
+
+# Runs in the page; takes one DOM_SELECTORS entry and returns {field: text | [text]}
+DOM_EXTRACT_JS = """
+(selectors) => {
+  const clean = (el) => (el.innerText || '').replace(/\\s+/g, ' ').trim();
+  const data = {};
+  for (const [field, spec] of Object.entries(selectors)) {
+    if (spec.all) {
+      const items = Array.from(document.querySelectorAll(spec.selector)).map(clean).filter(Boolean);
+      data[field] = items.length ? items : 'Not available';
+    } else {
+      const el = document.querySelector(spec.selector);
+      data[field] = el && clean(el) ? clean(el) : 'Not available';
+    }
+  }
+  return data;
+}
+"""
+
+def _selectors_for(profile_url: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    hostname = urlparse(profile_url).hostname or ""
+    for domain, selectors in DOM_SELECTORS.items():
+        if hostname == domain or hostname.endswith(f".{domain}"):
+            return selectors
+    return None
+
+def _is_valid_dom_result(data: Any, fields: List[str] = DEFAULT_FIELDS) -> bool:
+    """Lightweight schema check: a dict of str / list-of-str values with the requested required fields present."""
+    if not isinstance(data, dict):
+        return False
+    for value in data.values():
+        if not (isinstance(value, str) or (isinstance(value, list) and all(isinstance(v, str) for v in value))):
+            return False
+    return all(data.get(field) not in (None, "", "Not available")
+               for field in DOM_REQUIRED_FIELDS if field in fields)
+
+def _retry_delay_for(error: str) -> float:
+    """Pick how long to wait before the step after one that failed with error."""
+    message = error.lower()
+    for marker, delay in RETRY_DELAYS:
+        if marker in message:
+            return delay
+    return DEFAULT_RETRY_DELAY
+
+async def _pause_after_failed_step(agent: Agent) -> None:
+    """on_step_end hook: browser_use handles step errors itself, so the error-type delay is applied here."""
+    last_result = agent.state.last_result
+    error = last_result[-1].error if last_result else None
+    if error:
+        delay = _retry_delay_for(error)
+        logger.info("Browser agent step failed, next step in %.1fs: %s", delay, error.splitlines()[0])
+        await asyncio.sleep(delay)
+
+def _extract_json(text: str) -> Optional[str]:
+    """
+    Slice the JSON object out of an agent answer, e.g. one wrapped in ```json fences or prose.
+
+    Args:
+        text: Raw step result
+
+    Returns:
+        Optional[str]: Text from the first '{' to the last '}', or None if there is no
+            closing brace after the first opening one (e.g. a truncated answer), so the parser is skipped
+    """
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end < start:
+        return None
+    # No finer truncation check: one that respects braces inside strings needs a Python-level scan
+    # (~230us on a 4KB answer), while orjson rejects a truncated object in ~9us
+    if start == 0 and end == len(text) - 1:
+        return text
+    return text[start:end + 1]
+
+def _parse_answer(text: Any) -> Optional[Tuple[str, Any]]:
+    """Return (raw text, parsed JSON) when text holds a JSON answer, else None."""
+    if not isinstance(text, str):
+        return None
+    json_text = _extract_json(text)
+    if json_text is None:
+        return None
+    try:
+        return text, json_loads(json_text)
+    except Exception as e:
+        logger.debug("Error parsing JSON: %s", e)
+        return None
+
+def _step_content(step) -> Optional[str]:
+    """Return the extracted content of a history step's last action (AgentHistory.result is a list of ActionResult)."""
+    results = getattr(step, 'result', None)
+    if not results:
+        return None
+    return getattr(results[-1], 'extracted_content', None)
+
+def _final_url(result) -> Optional[str]:
+    """Return the last page URL the agent visited."""
+    try:
+        urls = [url for url in result.urls() if url]
+    except (AttributeError, TypeError):
+        return None
+    return urls[-1] if urls else None
+
+def _final_answer(result) -> Optional[str]:
+    """Return the agent's final answer, i.e. what AgentHistoryList.final_result() reports."""
+    try:
+        return result.final_result()
+    except (AttributeError, IndexError):
+        return None
+
+# Shared planner LLMs per event loop and model; their async HTTP pool is bound to the loop it runs on
+_llms: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ChatOpenAI]]" = weakref.WeakKeyDictionary()
+
+def _get_llm(model: str) -> ChatOpenAI:
+    """Return the planner LLM for a model on the running loop, so agents reuse its HTTP connection pool."""
+    llms = _llms.setdefault(asyncio.get_running_loop(), {})
+    llm = llms.get(model)
+    if llm is None:
+        # temperature=0 keeps the JSON answer stable, so flaky output doesn't cost retries
+        llm = ChatOpenAI(model=model, temperature=0)
+        llms[model] = llm
+    return llm
+
 class LinkedinBrowserAgent:
     """LinkedIn browser automation agent using browser_use."""
     
-    def __init__(self, browser_url: str = None):
+    def __init__(self, browser_url: str = None, llm_model: str = "gpt-4o-mini", retry_delay: float = 1.0,
+                 cache: Optional[LLMCache] = None):
         """
         Initialize the LinkedIn browser agent.
         
         Args:
             browser_url: Browser connection URL from environment or default
+            llm_model: Planner model for the agent; pass "gpt-4o" for profiles the small model struggles with
+            retry_delay: Seconds browser_use waits after an LLM rate-limit error before retrying the step
+            cache: Store for extracted profiles, defaults to a disk cache under .cache/linkedin
         """
         self.browser_url = browser_url or os.getenv('BROWSER_DEBUG_URL', "http://127.0.0.1:9222")
-        self.browser = None
-        self.context = None
-        self.llm = ChatOpenAI(model="gpt-4o")
+        self.session = None
+        # Serializes agent-fallback runs on the shared session, created on the loop that first needs it
+        self._agent_lock: Optional[asyncio.Lock] = None
+        self.llm_model = llm_model
+        self.retry_delay = retry_delay
+        self.cache = cache if cache is not None else DiskLLMCache(PROFILE_CACHE_DIR)
+
+    @property
+    def llm(self) -> ChatOpenAI:
+        """The shared planner LLM for the running event loop."""
+        return _get_llm(self.llm_model)
+
+    def _ensure_session(self) -> BrowserSession:
+        """Return the browser session, connecting it on first use and reusing it afterwards."""
+        if self.session is None:
+            # keep_alive stops Agent.run from tearing the session down after each profile
+            self.session = BrowserSession(cdp_url=self.browser_url, keep_alive=True)
+        return self.session
+
+    async def extract(self, profile_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract a profile in a new tab of the already connected browser.
+
+        Args:
+            profile_url: LinkedIn profile URL
+
+        Returns:
+            Optional[Dict[str, Any]]: Extracted profile data or None if failed
+        """
+        return await self.get_profile_data(profile_url)
     
-    async def get_profile_data(self, profile_url: str) -> Optional[Dict[str, Any]]:
+    async def get_profiles(self, profile_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract several profiles over the same browser session, so the CDP connection is made once.
+
+        Args:
+            profile_urls: LinkedIn profile URLs
+
+        Returns:
+            List[Optional[Dict[str, Any]]]: Profile data (or None) for each URL, in order
+        """
+        results = []
+        for profile_url in profile_urls:
+            results.append(await self.get_profile_data(profile_url))
+        return results
+
+    async def _extract_from_dom(self, session: BrowserSession, profile_url: str,
+                                fields: List[str] = DEFAULT_FIELDS) -> Optional[Dict[str, Any]]:
+        """
+        Read the profile fields straight from the rendered page, without any LLM calls.
+
+        Args:
+            session: Connected browser session
+            profile_url: LinkedIn profile URL
+            fields: Profile fields to extract
+
+        Returns:
+            Optional[Dict[str, Any]]: Profile data, or None if the page lacks the required fields
+        """
+        selectors = _selectors_for(profile_url)
+        if not selectors:
+            return None
+        wait_selector = selectors['Name']['selector']
+        # Current Position is derived from the experience list
+        wanted = set(fields) | ({'Previous Experience'} if 'Current Position' in fields else set())
+        selectors = {field: spec for field, spec in selectors.items() if field in wanted}
+        await session.start()
+        page = await session.browser_context.new_page()
+        try:
+            await page.goto(profile_url, wait_until="domcontentloaded", timeout=DOM_NAVIGATION_TIMEOUT_MS)
+            await page.wait_for_selector(wait_selector, timeout=DOM_NAVIGATION_TIMEOUT_MS)
+            # Redirects (e.g. to the login wall) mean we are not looking at the profile
+            if "/in/" not in page.url:
+                return None
+            data = await page.evaluate(DOM_EXTRACT_JS, selectors)
+        finally:
+            await page.close()
+        if not _is_valid_dom_result(data, fields):
+            return None
+        if 'Current Position' in fields:
+            experience = data.get('Previous Experience')
+            data['Current Position'] = experience[0] if isinstance(experience, list) else "Not available"
+            if 'Previous Experience' not in fields:
+                del data['Previous Experience']
+        return {
+            'profile_url': profile_url,
+            'extraction_method': 'dom_selectors',
+            'raw_result': str(data),
+            'parsed_data': data
+        }
+
+    async def get_profile_data(self, profile_url: str, fields: List[str] = DEFAULT_FIELDS,
+                               force_refresh: bool = False, ttl: int = PROFILE_CACHE_TTL) -> Optional[Dict[str, Any]]:
+        """
+        Extract LinkedIn profile data, serving recent extractions from the cache.
+
+        Args:
+            profile_url: LinkedIn profile URL
+            fields: Profile fields to extract; fewer fields means a shorter prompt and answer
+            force_refresh: Re-scrape even when a cached result exists
+            ttl: Maximum age in seconds of a cached result
+
+        Returns:
+            Optional[Dict[str, Any]]: Extracted profile data or None if failed
+        """
+        cache_key = make_cache_key(profile_url, PROFILE_PROMPT_VERSION, fields)
+        if not force_refresh:
+            cached = self.cache.get(cache_key, ttl=ttl)
+            if cached is not None:
+                logger.info("LinkedIn profile served from cache")
+                return cached
+        profile_data = await self._scrape_profile(profile_url, fields)
+        # Only successful extractions are cached; failures are retried next time
+        if profile_data and profile_data.get('parsed_data'):
+            self.cache.set(cache_key, profile_data)
+        return profile_data
+
+    async def _scrape_profile(self, profile_url: str, fields: List[str]) -> Optional[Dict[str, Any]]:
         """
         Extract LinkedIn profile data using browser automation.
-        
+
+        The page is read with DOM selectors first, in its own tab; the LLM-driven
+        agent only runs when that doesn't yield the required fields, one run at a time.
+
         Args:
             profile_url: LinkedIn profile URL
-            
+            fields: Profile fields to extract
+
         Returns:
             Optional[Dict[str, Any]]: Extracted profile data or None if failed
         """
         try:
-            # Only print on error or final result
-            #  browser, context = await self._initialize_browser()
-
-            session = BrowserSession(cdp_url="http://127.0.0.1:9222")
-
-
-            extraction_task = f"""
-            Navigate directly to {profile_url} and extract the profile information.
-            Steps:
-            1. REMEMBER the most important RULE: ALWAYS open first a new tab.
-            2. Go directly to {profile_url}. Ensure that URL is {profile_url}. Otherwise, stop here & fail the task.
-            3. Extract the following information:
-               - Name
-               - Headline (job title and company)
-               - Location
-               - Current position details
-               - Previous experience
-               - Education
-               - Skills
-               - About/Summary
-            Do not search Google or use any search engine. Go directly to the provided URL.
-            Return the data as a JSON object with keys: Name, Headline, Location, Current Position, Previous Experience, Education, Skills, About.
-            If any information is not available, mark it as \"Not available\".
-
-            DO IT IN ONE SHOT. Don't unnecessary reiterate.
-            """
-            agent = Agent(
-                task=extraction_task,
-                # browser=browser,
-                # browser_context=context,
-                browser_session=session,
-                llm=self.llm,
-                max_failures=3,
-                retry_delay=5,
-                max_actions_per_step=3,
-                use_vision=False,
+            session = self._ensure_session()
+            try:
+                profile_data = await self._extract_from_dom(session, profile_url, fields)
+                if profile_data:
+                    logger.info("LinkedIn profile extracted from page DOM")
+                    return profile_data
+            except Exception as e:
+                logger.info("DOM extraction failed, falling back to browser agent: %s", e)
+
+            extraction_task = _EXTRACTION_TEMPLATE.format(
+                field_lines=_field_lines(tuple(fields)),
+                keys=", ".join(fields),
+                url=profile_url,
             )
-            result = await agent.run(max_steps=10)
+            # browser_use tracks one current page per BrowserSession, so concurrent agents on the
+            # shared session would switch tabs under each other; only the DOM path runs in parallel
+            if self._agent_lock is None:
+                self._agent_lock = asyncio.Lock()
+            async with self._agent_lock:
+                agent = Agent(
+                    task=extraction_task,
+                    # browser=browser,
+                    # browser_context=context,
+                    browser_session=session,
+                    llm=self.llm,
+                    max_failures=3,
+                    # Only browser_use's wait after an LLM rate-limit error; other failed steps use _pause_after_failed_step
+                    retry_delay=self.retry_delay,
+                    # Room to scroll, extract and return in one step, so fewer planner calls
+                    max_actions_per_step=6,
+                    use_vision=False,
+                )
+                result = await agent.run(max_steps=5, on_step_end=_pause_after_failed_step)
             if result:
                 profile_data = self._parse_result(result, profile_url)
-                print("LinkedIn profile extraction completed successfully")
+                logger.info("LinkedIn profile extraction completed successfully")
                 return profile_data
             else:
-                print("Failed to extract LinkedIn profile data")
+                logger.warning("Failed to extract LinkedIn profile data")
                 return None
         except Exception as e:
-            print(f"Error extracting LinkedIn profile data: {str(e)}")
+            logger.error("Error extracting LinkedIn profile data: %s", e)
             return None
             
     def _parse_result(self, result, profile_url: str) -> Dict[str, Any]:
@@ -95,30 +418,33 @@ class LinkedinBrowserAgent:
             Dict[str, Any]: Structured profile data
         """
         try:
-            # Try to find the last message with a JSON result
-            if hasattr(result, 'history') and hasattr(result.history, '__iter__'):
-                for step in reversed(result.history):
-                    if hasattr(step, 'result') and isinstance(step.result, str) and step.result.strip().startswith('{'):
-                        import json
-                        try:
-                            parsed = json.loads(step.result)
-                            return {
-                                'profile_url': profile_url,
-                                'extraction_method': 'browser_automation',
-                                'raw_result': step.result,
-                                'parsed_data': parsed
-                            }
-                        except Exception as e:
-                            print(f"Error parsing JSON: {str(e)}")
-            # fallback: just return the last result as string
+            # The answer is almost always the final result; only scan earlier steps on a miss
+            found = _parse_answer(_final_answer(result))
+            history = getattr(result, 'history', None)
+            if found is None and history:
+                for step in islice(reversed(history), 1, None):
+                    found = _parse_answer(_step_content(step))
+                    if found is not None:
+                        break
+            if found is not None:
+                raw_result, parsed = found
+                return {
+                    'profile_url': profile_url,
+                    'extraction_method': 'browser_automation',
+                    'raw_result': raw_result,
+                    'parsed_data': parsed
+                }
+            # fallback: just return the last result as string, with where the agent ended up
             return {
                 'profile_url': profile_url,
                 'extraction_method': 'browser_automation',
                 'raw_result': str(result),
-                'parsed_data': {}
+                'parsed_data': {},
+                'final_answer': _final_answer(result),
+                'page_url': _final_url(result)
             }
         except Exception as e:
-            print(f"Error parsing LinkedIn result: {str(e)}")
+            logger.error("Error parsing LinkedIn result: %s", e)
             return {
                 'profile_url': profile_url,
                 'extraction_method': 'browser_automation',
@@ -128,13 +454,95 @@ class LinkedinBrowserAgent:
             }
             
     async def close_browser(self):
-        """Close the browser."""
-        if self.browser:
+        """Close the browser session so it doesn't linger on the CDP endpoint."""
+        if self.session:
             try:
-                await self.browser.close()
-                print("Browser closed")
+                # stop() is a no-op on keep_alive sessions; kill() really tears it down
+                await self.session.kill()
+                logger.info("Browser closed")
             except Exception as e:
-                print(f"Error closing browser: {str(e)}")
+                logger.error("Error closing browser: %s", e)
+            finally:
+                self.session = None
+
+# One long-lived agent (and browser connection) per event loop, since the session is bound to it;
+# the sync wrappers all share the background loop and so one agent
+_shared_agents: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LinkedinBrowserAgent]" = weakref.WeakKeyDictionary()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+# LinkedIn throttles hard: past ~5 extractions in flight the retry storm makes the whole batch slower
+DEFAULT_MAX_CONCURRENCY = 3
+# Answers that mean LinkedIn throttled us; those extractions are retried with exponential backoff
+# Matched against where the agent ended up and its final answer only, never the scraped page text,
+# which can mention rate limits in an ordinary profile
+RATE_LIMIT_URL_MARKERS = ('/checkpoint/',)
+# A login-wall redirect means the browser isn't signed in to LinkedIn, which waiting doesn't fix
+AUTHWALL_URL_MARKER = '/authwall'
+RATE_LIMIT_ANSWER_MARKERS = ('too many requests', 'http error 429')
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF_BASE = 5.0
+
+# Process-wide gate on extractions (per event loop, which a semaphore is bound to)
+_extraction_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _extraction_semaphore() -> asyncio.Semaphore:
+    """Return the extraction gate for the running event loop, shared by single and batch extractions."""
+    loop = asyncio.get_running_loop()
+    semaphore = _extraction_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+        _extraction_semaphores[loop] = semaphore
+    return semaphore
+
+def _is_rate_limited(profile_data: Optional[Dict[str, Any]]) -> bool:
+    if not profile_data or profile_data.get('parsed_data'):
+        return False
+    page_url = (profile_data.get('page_url') or '').lower()
+    if any(marker in page_url for marker in RATE_LIMIT_URL_MARKERS):
+        return True
+    final_answer = (profile_data.get('final_answer') or '').lower()
+    return any(marker in final_answer for marker in RATE_LIMIT_ANSWER_MARKERS)
+
+async def _extract_with_backoff(client: LinkedinBrowserAgent, profile_url: str) -> Optional[Dict[str, Any]]:
+    """Extract a profile through the shared gate, backing off exponentially while LinkedIn rate limits us."""
+    async with _extraction_semaphore():
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            profile_data = await client.extract(profile_url)
+            if profile_data and AUTHWALL_URL_MARKER in (profile_data.get('page_url') or ''):
+                logger.error("LinkedIn sent %s to the login wall: the browser at %s is not logged in to LinkedIn",
+                             profile_url, client.browser_url)
+                return profile_data
+            if not _is_rate_limited(profile_data) or attempt == RATE_LIMIT_RETRIES:
+                return profile_data
+            # The slot is held while waiting, so throttling also lowers the effective concurrency
+            delay = RATE_LIMIT_BACKOFF_BASE * 2 ** attempt
+            logger.warning("LinkedIn rate limited %s, retrying in %.0fs", profile_url, delay)
+            await asyncio.sleep(delay)
+
+async def get_shared_agent(browser_url: str = None) -> LinkedinBrowserAgent:
+    """
+    Get the LinkedinBrowserAgent shared on the running event loop, creating it on first use.
+
+    Args:
+        browser_url: Browser connection URL, only used when the agent is created
+
+    Returns:
+        LinkedinBrowserAgent: The shared agent
+    """
+    loop = asyncio.get_running_loop()
+    agent = _shared_agents.get(loop)
+    if agent is None:
+        agent = LinkedinBrowserAgent(browser_url)
+        _shared_agents[loop] = agent
+    return agent
+
+async def close_shared_agent() -> None:
+    """Close the running loop's shared agent; call before leaving an asyncio.run that used the async wrappers."""
+    agent = _shared_agents.pop(asyncio.get_running_loop(), None)
+    if agent:
+        await agent.close_browser()
 
 # Async wrapper for easier integration
 async def get_linkedin_profile_async(profile_url: str, browser_url: str = None) -> Optional[Dict[str, Any]]:
@@ -148,16 +556,73 @@ async def get_linkedin_profile_async(profile_url: str, browser_url: str = None)
     Returns:
         Optional[Dict[str, Any]]: Profile data or None
     """
-    client = LinkedinBrowserAgent(browser_url)
+    client = await get_shared_agent(browser_url)
+    return await _extract_with_backoff(client, profile_url)
+
+async def get_linkedin_profiles_async(profile_urls: List[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                                      browser_url: str = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Extract several LinkedIn profiles concurrently with the shared agent.
+
+    Args:
+        profile_urls: LinkedIn profile URLs
+        max_concurrency: Maximum number of this batch's extractions in flight; all extractions
+            together are also capped at DEFAULT_MAX_CONCURRENCY. Raising it past ~5 lowers total
+            throughput, as LinkedIn throttling turns into retries
+        browser_url: Browser connection URL
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: Profile data (or None) for each URL, in order
+    """
+    client = await get_shared_agent(browser_url)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(profile_url: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _extract_with_backoff(client, profile_url)
+
+    results = await asyncio.gather(*[_bounded(url) for url in profile_urls], return_exceptions=True)
+    profiles = []
+    for profile_url, result in zip(profile_urls, results):
+        if isinstance(result, BaseException):
+            logger.error("Error extracting LinkedIn profile %s: %s", profile_url, result)
+            result = None
+        profiles.append(result)
+    return profiles
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the persistent event loop, starting it in a daemon thread on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="linkedin-browser-loop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+def _run_on_shared_loop(coro):
+    """Run a coroutine on the background loop and wait for it; safe to call from any thread."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+def _close_background_agent():
+    """At exit, disconnect the sync wrappers' agent from the browser while its loop still runs."""
+    loop = _loop
+    if loop is None or loop.is_closed() or loop not in _shared_agents:
+        return
     try:
-        return await client.get_profile_data(profile_url)
-    finally:
-        await client.close_browser()
+        asyncio.run_coroutine_threadsafe(close_shared_agent(), loop).result(timeout=10)
+    except Exception as e:
+        logger.error("Error closing shared LinkedIn agent: %s", e)
+
+atexit.register(_close_background_agent)
 
 # Synchronous wrapper for compatibility
 def get_linkedin_profile_data(profile_url: str, browser_url: str = None) -> Optional[Dict[str, Any]]:
     """
     Synchronous wrapper to get LinkedIn profile data.
+
+    Unlike asyncio.run, the event loop is kept between calls so the shared
+    browser session stays connected.
     
     Args:
         profile_url: LinkedIn profile URL
@@ -167,12 +632,32 @@ def get_linkedin_profile_data(profile_url: str, browser_url: str = None) -> Opti
         Optional[Dict[str, Any]]: Profile data or None
     """
     try:
-        return asyncio.run(get_linkedin_profile_async(profile_url, browser_url))
+        return _run_on_shared_loop(get_linkedin_profile_async(profile_url, browser_url))
     except Exception as e:
-        print(f"Error in synchronous LinkedIn profile extraction: {str(e)}")
+        logger.error("Error in synchronous LinkedIn profile extraction: %s", e)
         return None
 
+def get_linkedin_profiles(profile_urls: List[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                          browser_url: str = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Synchronous wrapper to extract several LinkedIn profiles in one batch.
+
+    Args:
+        profile_urls: LinkedIn profile URLs
+        max_concurrency: Maximum number of extractions in flight
+        browser_url: Browser connection URL
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: Profile data (or None) for each URL, in order
+    """
+    try:
+        return _run_on_shared_loop(get_linkedin_profiles_async(profile_urls, max_concurrency, browser_url))
+    except Exception as e:
+        logger.error("Error in synchronous LinkedIn batch extraction: %s", e)
+        return [None] * len(profile_urls)
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # Test the LinkedIn browser agent
     test_url = "https://www.linkedin.com/in/alosan"
     
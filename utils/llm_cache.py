@@ -0,0 +1,87 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import time
+from typing import Any, Dict, Optional, Protocol
+from utils.fast_json import dumps_canonical
+
+logger = logging.getLogger(__name__)
+
+class LLMCache(Protocol):
+    """Interface for LLM response caches, so the disk backend can be swapped (e.g. for Redis)."""
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        ...
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a deterministic cache key from JSON-serializable parts.
+
+    Args:
+        parts: Values to hash; dicts are canonicalized with sorted keys
+
+    Returns:
+        str: SHA256 hex digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(dumps_canonical(part))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class DiskLLMCache:
+    """Exact-match cache of LLM responses (or any JSON-serializable result) storing one JSON file per key."""
+
+    def __init__(self, cache_dir: str = ".cache/llm"):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or when the entry is older than ttl seconds."""
+        path = self._path(key)
+        try:
+            if ttl is not None and time.time() - os.path.getmtime(path) > ttl:
+                self.misses += 1
+                return None
+            with open(path) as f:
+                value = json.load(f)['response']
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("Error reading LLM cache entry %s: %s", key, e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, writing to a temp file first so readers never see a partial entry."""
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'response': value}, f)
+            os.replace(tmp_path, self._path(key))
+            self.writes += 1
+        except Exception as e:
+            logger.error("Error writing LLM cache entry %s: %s", key, e)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes}
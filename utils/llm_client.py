@@ -1,51 +1,256 @@
 import os
-from typing import Optional
+import sys
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, Timeout
+# Let the __main__ smoke test run as a script (python utils/llm_client.py), not only with -m
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.llm_cache import LLMCache, DiskLLMCache, make_cache_key
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Enough for short answers and JSON extraction; pass more for long-form output
+DEFAULT_MAX_OUTPUT_TOKENS = 1024
+
+# One OpenAI client (and httpx connection pool) shared by every LLMClient
+_SHARED_CLIENT: Optional[OpenAI] = None
+_shared_client_lock = threading.Lock()
+
+def _get_client() -> OpenAI:
+    """Return the process-wide OpenAI client, creating it on first use."""
+    global _SHARED_CLIENT
+    with _shared_client_lock:
+        if _SHARED_CLIENT is None:
+            api_key = os.getenv('OPENAI_API_KEY')
+            if not api_key:
+                raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
+            _SHARED_CLIENT = OpenAI(api_key=api_key)
+        return _SHARED_CLIENT
+
+def _incomplete_reason(response) -> Optional[str]:
+    """Return why a response stopped short (e.g. 'max_output_tokens'), or None if it completed."""
+    if getattr(response, 'status', None) != 'incomplete':
+        return None
+    details = getattr(response, 'incomplete_details', None)
+    return getattr(details, 'reason', None) or 'unknown'
+
 class LLMClient:
-    def __init__(self, model_name: str = "gpt-4.1"):
+    def __init__(self, model_name: str = "gpt-4.1", cache: Optional[LLMCache] = None):
         self.model_name = model_name
         self.client = self._initialize_client()
+        self.cache = cache if cache is not None else DiskLLMCache()
+        # One AsyncOpenAI per event loop, since its connection pool is bound to the loop it runs on
+        self._aclients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
         
     def _initialize_client(self) -> OpenAI:
-        """Initialize the OpenAI client."""
+        """Get the shared OpenAI client, so keep-alive connections are reused across instances."""
         try:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
-                raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
-            return OpenAI(api_key=api_key)
+            return _get_client()
         except Exception as e:
-            print(f"Error initializing OpenAI client: {str(e)}")
+            logger.error("Error initializing OpenAI client: %s", e)
             raise
             
-    def get_completion(self, system_prompt: str, user_prompt: str) -> Optional[str]:
+    def _get_aclient(self) -> AsyncOpenAI:
+        """Return the async client for the running event loop, creating it on first use there."""
+        loop = asyncio.get_running_loop()
+        aclient = self._aclients.get(loop)
+        if aclient is None:
+            aclient = AsyncOpenAI(api_key=self.client.api_key)
+            self._aclients[loop] = aclient
+        return aclient
+
+    def _should_retry_larger(self, response, max_output_tokens: int, retry_max_output_tokens: Optional[int]) -> bool:
+        if _incomplete_reason(response) != 'max_output_tokens':
+            return False
+        if not retry_max_output_tokens or retry_max_output_tokens <= max_output_tokens:
+            return False
+        logger.warning("Completion hit the %s token cap, retrying with %s", max_output_tokens, retry_max_output_tokens)
+        return True
+
+    def _build_request(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                       json_mode: bool) -> Dict[str, Any]:
+        """Build the Responses API arguments; their hash is the cache key."""
+        request = {
+            'model': self.model_name,
+            'input': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            'max_output_tokens': max_output_tokens
+        }
+        if json_mode:
+            # The prompt must mention JSON; the model then skips any surrounding prose
+            request['text'] = {"format": {"type": "json_object"}}
+        return request
+
+    def get_completion(self, system_prompt: str, user_prompt: str, use_cache: bool = True,
+                       max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS, json_mode: bool = False,
+                       retry_max_output_tokens: Optional[int] = None) -> Optional[str]:
         """
         Get completion from OpenAI Responses API with web search capability.
         
         Args:
             system_prompt: System prompt for the conversation
             user_prompt: User prompt for the analysis request
+            use_cache: Return a cached completion for identical requests, and cache new ones
+            max_output_tokens: Output cap; size it to the task, latency and cost grow with output length
+            json_mode: Constrain the output to a JSON object (the prompt must ask for JSON)
+            retry_max_output_tokens: Larger cap to retry with once when the answer is cut off at max_output_tokens
             
         Returns:
-            Optional[str]: The completion response or None if failed
+            Optional[str]: The completion response, or None if failed or incomplete
+        """
+        request = self._build_request(system_prompt, user_prompt, max_output_tokens, json_mode)
+        cache_key = make_cache_key(request)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        try:
+            response = self.client.responses.create(**request)
+            if self._should_retry_larger(response, max_output_tokens, retry_max_output_tokens):
+                response = self.client.responses.create(**{**request, 'max_output_tokens': retry_max_output_tokens})
+            reason = _incomplete_reason(response)
+            if reason:
+                # output_text still holds the partial answer; never return or cache it
+                logger.warning("Discarding incomplete completion: %s", reason)
+                return None
+            if use_cache and response.output_text:
+                self.cache.set(cache_key, response.output_text)
+            return response.output_text
+        except Exception as e:
+            logger.error("Error getting completion: %s", e)
+            return None
+
+    def get_completion_stream(self, system_prompt: str, user_prompt: str, token_timeout: float = 30.0,
+                              use_cache: bool = True, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+                              json_mode: bool = False) -> Iterator[str]:
+        """
+        Stream a completion as text deltas, so callers can start on the first tokens.
+
+        Args:
+            system_prompt: System prompt for the conversation
+            user_prompt: User prompt for the analysis request
+            token_timeout: Seconds to wait for the next chunk before giving up
+            use_cache: Yield a cached completion in one piece, and cache the full text once streamed
+            max_output_tokens: Output cap, see get_completion
+            json_mode: Constrain the output to a JSON object, see get_completion
+
+        Yields:
+            str: Output text deltas. When the response is cut off or fails, the stream
+                stops there and nothing is cached, so the text yielded so far is partial.
+        """
+        request = self._build_request(system_prompt, user_prompt, max_output_tokens, json_mode)
+        cache_key = make_cache_key(request)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        chunks = []
+        try:
+            # The read timeout applies between chunks, i.e. per token
+            stream = self.client.responses.create(**request, stream=True, timeout=Timeout(60.0, read=token_timeout))
+        except Exception as e:
+            logger.error("Error streaming completion: %s", e)
+            return
+        # Closes the HTTP response even when the caller stops iterating early
+        with stream:
+            events = iter(stream)
+            while True:
+                # Only API and network errors are handled; exceptions thrown in at the yield propagate
+                try:
+                    event = next(events)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    logger.error("Error streaming completion: %s", e)
+                    return
+                if event.type == "response.output_text.delta":
+                    chunks.append(event.delta)
+                    yield event.delta
+                elif event.type == "response.incomplete":
+                    logger.warning("Streamed completion is incomplete: %s", _incomplete_reason(event.response))
+                    return
+                elif event.type == "response.failed":
+                    logger.error("Streamed completion failed: %s", event.response.error)
+                    return
+                elif event.type == "error":
+                    logger.error("Error streaming completion: %s", event.message)
+                    return
+        if use_cache and chunks:
+            self.cache.set(cache_key, "".join(chunks))
+
+    async def aget_completion(self, system_prompt: str, user_prompt: str, use_cache: bool = True,
+                              max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS, json_mode: bool = False,
+                              retry_max_output_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Async version of get_completion using AsyncOpenAI.
+
+        Args:
+            system_prompt: System prompt for the conversation
+            user_prompt: User prompt for the analysis request
+            use_cache: Return a cached completion for identical requests, and cache new ones
+            max_output_tokens: Output cap, see get_completion
+            json_mode: Constrain the output to a JSON object, see get_completion
+            retry_max_output_tokens: Larger cap to retry a cut-off answer with, see get_completion
+
+        Returns:
+            Optional[str]: The completion response, or None if failed or incomplete
         """
+        request = self._build_request(system_prompt, user_prompt, max_output_tokens, json_mode)
+        cache_key = make_cache_key(request)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
         try:
-            response = self.client.responses.create(
-                model=self.model_name,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_output_tokens=4000
-            )
+            aclient = self._get_aclient()
+            response = await aclient.responses.create(**request)
+            if self._should_retry_larger(response, max_output_tokens, retry_max_output_tokens):
+                response = await aclient.responses.create(**{**request, 'max_output_tokens': retry_max_output_tokens})
+            reason = _incomplete_reason(response)
+            if reason:
+                logger.warning("Discarding incomplete completion: %s", reason)
+                return None
+            if use_cache and response.output_text:
+                self.cache.set(cache_key, response.output_text)
             return response.output_text
         except Exception as e:
-            print(f"Error getting completion: {str(e)}")
+            logger.error("Error getting completion: %s", e)
             return None
+
+    async def abatch_completions(self, prompts: List[Tuple[str, str]], max_concurrency: int = 8,
+                                 use_cache: bool = True, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+                                 json_mode: bool = False,
+                                 retry_max_output_tokens: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Run many completions concurrently.
+
+        Args:
+            prompts: (system_prompt, user_prompt) pairs
+            max_concurrency: Maximum number of requests in flight
+            use_cache, max_output_tokens, json_mode, retry_max_output_tokens: Passed through to aget_completion
+
+        Returns:
+            List[Optional[str]]: Completions (or None on failure), in the order of prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _bounded(system_prompt: str, user_prompt: str) -> Optional[str]:
+            async with semaphore:
+                return await self.aget_completion(system_prompt, user_prompt, use_cache, max_output_tokens, json_mode,
+                                                  retry_max_output_tokens)
+
+        return await asyncio.gather(*[_bounded(system, user) for system, user in prompts])
         
 if __name__ == "__main__":
     llm_client = LLMClient()